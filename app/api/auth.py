@@ -1,3 +1,4 @@
+import hmac
 from fastapi import APIRouter, HTTPException, status
 from app.models.auth import UserLogin, Token
 from app.core import security
@@ -9,8 +10,9 @@ router = APIRouter()
 
 @router.post("/login", response_model=Token)
 async def login(credentials: UserLogin):
-    if (credentials.username == settings.ADMIN_USERNAME and 
-        credentials.password == settings.ADMIN_PASSWORD):
+    username_ok = hmac.compare_digest(credentials.username.encode(), settings.ADMIN_USERNAME.encode())
+    password_ok = hmac.compare_digest(credentials.password.encode(), settings.ADMIN_PASSWORD.encode())
+    if username_ok and password_ok:
         
         token = security.create_access_token(data={"sub": credentials.username})
         return {"access_token": token, "token_type": "bearer"}
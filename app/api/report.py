@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
 import httpx  # You might need to install this: pip install httpx
-from typing import List
+from cachetools import TTLCache
+import orjson
+from collections import Counter
+from typing import List, Optional
 
 from app.models.psychometric import StudentDetailsInput, ReportRequest
 from app.services import test_logic, llm_service, pdf_service
@@ -9,61 +13,85 @@ from app.core.logging_config import app_logger
 
 router = APIRouter()
 
-@router.post("/generate")
-async def generate_report(
-    request: ReportRequest,
-    current_user: str = Depends(verify_token)
-):
+MAX_PROFILE_BYTES = 5_000_000
+MAX_BATCH_ITEMS = 50
+MAX_BATCH_CONCURRENCY = 5
+
+_profile_cache = TTLCache(maxsize=512, ttl=300)
+_profile_cache_lock = asyncio.Lock()
+
+
+async def _get_student(client: httpx.AsyncClient, url: str) -> dict:
     """
-    1. Accepts ProfileURL.
-    2. Fetches the JSON data from that URL.
-    3. Parses it into the StudentDetailsInput model.
-    4. Generates the report.
+    Fetches the raw student record behind a ProfileURL.
+    Records are cached for a few minutes so regenerating a report
+    (e.g. with a different model) skips the round-trip.
+    """
+    async with _profile_cache_lock:
+        cached = _profile_cache.get(url)
+    if cached is not None:
+        return dict(cached)
+
+    try:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            buf = bytearray()
+            async for chunk in response.aiter_bytes():
+                buf.extend(chunk)
+                if len(buf) > MAX_PROFILE_BYTES:
+                    raise HTTPException(status_code=413, detail="Profile response too large")
+        external_data_list = orjson.loads(buf)
+    except HTTPException:
+        raise
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=400, detail=f"Failed to fetch profile: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid URL or non-JSON response: {e}")
+
+    if isinstance(external_data_list, list) and len(external_data_list) > 0:
+        student_data = external_data_list[0] 
+    elif isinstance(external_data_list, dict):
+        student_data = external_data_list
+    else:
+        raise HTTPException(status_code=400, detail="Invalid JSON structure from ProfileURL")
+
+    async with _profile_cache_lock:
+        _profile_cache[url] = student_data
+    return dict(student_data)
+
+
+async def _pipeline(request: ReportRequest, app, filename_suffix: Optional[str] = None) -> dict:
+    """
+    Runs fetch, processing, AI analysis and PDF rendering for one ProfileURL.
+    `filename_suffix` is appended to the PDF name, for reports of the same
+    student that must not overwrite each other.
     """
     app_logger.info(f"Report generation requested for URL: {request.profile_url}")
     
     try:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(str(request.profile_url))
-                response.raise_for_status()
-                external_data_list = response.json()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(status_code=400, detail=f"Failed to fetch profile: {e}")
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=f"Invalid URL or non-JSON response: {e}")
-
-        if isinstance(external_data_list, list) and len(external_data_list) > 0:
-            student_data = external_data_list[0] 
-        elif isinstance(external_data_list, dict):
-            student_data = external_data_list
-        else:
-            raise HTTPException(status_code=400, detail="Invalid JSON structure from ProfileURL")
-
+        client = app.state.http_client
+        student_data = await _get_student(client, str(request.profile_url))
         student_data['model'] = request.model
 
         try:
-            student_input = StudentDetailsInput(**student_data)
+            student_input = StudentDetailsInput.model_validate(student_data)
         except Exception as e:
             raise HTTPException(status_code=422, detail=f"Data validation failed: {str(e)}")
 
         app_logger.info(f"Processing report for Student: {student_input.student_name}")
 
-        processed_tests = []
-        for raw_test in student_input.psychometric_data:
-            if not raw_test.json_result or raw_test.json_result == "":
-                continue
-                
-            processed = test_logic.TestProcessor.process_raw(raw_test)
-            if processed.sections:
-                processed_tests.append(processed)
-            
+        processed_tests = await test_logic.build_processed_tests_async(
+            student_input.psychometric_data
+        )
+
         ai_result = await llm_service.generate_ai_analysis(student_input, processed_tests)
         
-        filename, report_url = pdf_service.generate_pdf(
-            student_input, 
+        filename, report_url = await pdf_service.generate_pdf(
+            student_input,
             processed_tests,
-            ai_result
+            ai_result,
+            out_path=pdf_service.report_path(student_input, filename_suffix),
+            executor=app.state.pdf_pool
         )
         
         return {
@@ -75,4 +103,61 @@ async def generate_report(
         raise he
     except Exception as e:
         app_logger.error(f"Generation failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/generate")
+async def generate_report(
+    request: ReportRequest,
+    request_obj: Request,
+    current_user: str = Depends(verify_token)
+):
+    """
+    1. Accepts ProfileURL.
+    2. Fetches the JSON data from that URL.
+    3. Parses it into the StudentDetailsInput model.
+    4. Generates the report.
+    """
+    return await _pipeline(request, request_obj.app)
+
+
+@router.post("/generate_batch")
+async def generate_report_batch(
+    request_obj: Request,
+    requests: List[ReportRequest] = Body(..., max_length=MAX_BATCH_ITEMS),
+    current_user: str = Depends(verify_token)
+):
+    """
+    Generates reports for up to MAX_BATCH_ITEMS ProfileURLs, at most
+    MAX_BATCH_CONCURRENCY at a time.
+    Identical entries are generated once. A ProfileURL requested with several
+    models gets one PDF per model (the model is added to the file name).
+    Each entry in the response is either the report result or the error for that profile.
+    """
+    semaphore = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+    unique = {}
+    for r in requests:
+        unique.setdefault((str(r.profile_url), r.model), r)
+    url_counts = Counter(url for url, _ in unique)
+
+    async def run(r: ReportRequest) -> dict:
+        suffix = r.model if url_counts[str(r.profile_url)] > 1 else None
+        async with semaphore:
+            return await _pipeline(r, request_obj.app, suffix)
+
+    unique_results = await asyncio.gather(
+        *[run(r) for r in unique.values()],
+        return_exceptions=True
+    )
+    by_key = dict(zip(unique, unique_results))
+    results = [by_key[(str(r.profile_url), r.model)] for r in requests]
+
+    response = []
+    for result in results:
+        if isinstance(result, HTTPException):
+            response.append({"error": result.detail, "status_code": result.status_code})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            response.append(result)
+    return response
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
@@ -19,6 +19,25 @@ class Settings(BaseSettings):
     ADMIN_PASSWORD: str
 
     BASE_URL: str = "http://localhost:8000"
+    PDF_ENGINE: Literal["weasyprint", "wkhtmltopdf"] = "wkhtmltopdf"
+    # Per uvicorn worker; the Dockerfile runs 3 of them.
+    PDF_WORKERS: int = max(1, (os.cpu_count() or 1) // 3)
+
+    REDIS_URL: Optional[str] = None
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    SEMANTIC_CACHE_TOLERANCE: float = 0.0
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 10000
+
+    ENABLE_BATCH: bool = False
+    BATCH_WINDOW_MS: int = 200
+    BATCH_MAX_SIZE: int = 64
+
+    LLM_MAX_CONCURRENCY: int = 10
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+
+    MAX_SUMMARY_TOKENS: int = 1500
+    SUMMARY_INTERPRETATION_CHARS: int = 120
     
     model_config = SettingsConfigDict(
         env_file=".env", 
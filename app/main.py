@@ -1,10 +1,37 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+import httpx
+import multiprocessing
 import os
 
 from app.api import auth, report
 from app.core.config import settings
+from app.services import llm_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Builds the shared HTTP client and PDF worker pool on startup and
+    releases them, along with the LLM connection pool, on shutdown.
+    """
+    app.state.http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0, connect=2.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        http2=True
+    )
+    app.state.pdf_pool = ProcessPoolExecutor(
+        max_workers=settings.PDF_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver")
+    )
+    app.openapi()
+    yield
+    await app.state.http_client.aclose()
+    await llm_service.llm_http_client.aclose()
+    app.state.pdf_pool.shutdown()
 
 
 app = FastAPI(
@@ -12,7 +39,8 @@ app = FastAPI(
     description="A production-ready API for generating PDF psychometric reports with AI analysis.",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, HttpUrl
 from typing import List, Optional, Literal
-import json
+import orjson
+from functools import cached_property
 
 
 class SectionData(BaseModel):
@@ -20,17 +21,22 @@ class RawPsychometricTest(BaseModel):
     category: str = Field(..., alias="PsychometricTestCategory")
     json_result: Optional[str] = Field(None, alias="JsonResult")
 
-    @property
-    def parsed_sections(self) -> List[SectionData]:
-        if not self.json_result:
-            return []
+    @cached_property
+    def parsed_result(self) -> dict:
+        """The decoded JsonResult object, parsed once; {} if missing or not an object."""
+        json_result = self.json_result
+        if not json_result or not json_result.lstrip().startswith('{'):
+            return {}
         try:
-            data = json.loads(self.json_result)
-            if not isinstance(data, dict): return []
-            raw_sections = data.get("sections", [])
-            return [SectionData(**s) for s in raw_sections]
-        except json.JSONDecodeError:
-            return []
+            data = orjson.loads(json_result)
+        except orjson.JSONDecodeError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @cached_property
+    def parsed_sections(self) -> List[SectionData]:
+        raw_sections = self.parsed_result.get("sections", [])
+        return [SectionData(**s) for s in raw_sections]
 
 class StudentDetailsInput(BaseModel):
     student_name: str = Field(..., alias="StudentName")
@@ -62,11 +68,16 @@ class ProcessedTest(BaseModel):
     sections: List[ProcessedSection]
     charts: dict
 
-class AIAnalysisResult(BaseModel):
+class AIAnalysisOutput(BaseModel):
     strengths: List[str]
     development_areas: List[str]
     recommended_roles: List[str]
     certifications: List[str]
     employability_score: int
     employability_text: str
-    employability_chart: Optional[str] = None
\ No newline at end of file
+
+class AIAnalysisResult(AIAnalysisOutput):
+    employability_chart: Optional[str] = None
+
+class VarkOutput(BaseModel):
+    vark_descriptions: List[str]
\ No newline at end of file
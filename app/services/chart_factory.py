@@ -1,28 +1,154 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 import io
 import base64
+import importlib.util
+import os
 import textwrap
-
-plt.switch_backend('Agg')
+import threading
+from functools import lru_cache
+
+patches = None
+setp = None
+Figure = None
+_MPL_LOCK = threading.Lock()
+
+_FIG_CACHE = threading.local()
+
+_VARK_DEFAULT_DESCS = [
+    'Visual learners prefer information presented in a visual format like graphs, charts, or diagrams.',
+    'Auditory learners learn best through listening and verbal instructions.',
+    'Reading/Writing learners excel when information is presented in written form, such as reading textbooks.',
+    'Kinesthetic learners learn by doing and prefer hands-on activities or practical experiences.'
+]
+_VARK_DEFAULT_WRAPPED = [textwrap.fill(d, width=28) for d in _VARK_DEFAULT_DESCS]
+
+_VARK_LAYOUT = [
+    {'letter': 'V', 'title': 'Visual', 'color': '#FFF1A8', 'center': (-1, 1), 'highlight_angle': (90, 180)},
+    {'letter': 'A', 'title': 'Auditory', 'color': '#C8F0A8', 'center': (1, 1), 'highlight_angle': (0, 90)},
+    {'letter': 'R', 'title': 'Reading / Writing', 'color': '#8CCAF2', 'center': (-1, -1), 'highlight_angle': (180, 270)},
+    {'letter': 'K', 'title': 'Kinesthetic', 'color': '#D69EF5', 'center': (1, -1), 'highlight_angle': (270, 360)},
+]
+
+
+_BOLD_FONT_FILE = 'DejaVuSans-Bold.ttf'
+_SYSTEM_FONT_DIRS = ['/usr/share/fonts/truetype/dejavu', '/usr/share/fonts/dejavu', '/usr/share/fonts/TTF']
+
+
+@lru_cache(maxsize=1)
+def _bold_font_path():
+    """
+    Locates the bold DejaVu face used for the gauge: matplotlib's bundled copy
+    first (found via its package spec, so matplotlib itself is not imported),
+    then the usual system font directories. None if neither has it.
+    """
+    spec = importlib.util.find_spec('matplotlib')
+    dirs = [os.path.join(d, 'mpl-data', 'fonts', 'ttf') for d in (spec.submodule_search_locations or [])] if spec else []
+    for d in dirs + _SYSTEM_FONT_DIRS:
+        path = os.path.join(d, _BOLD_FONT_FILE)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+@lru_cache(maxsize=16)
+def _segment_geom(n, start=90, gap=0.0):
+    """
+    Geometry of n equal segments laid out clockwise from `start` degrees,
+    each trimmed by `gap` degrees. Returns (theta1, theta2) bounds in degrees
+    plus cos/sin of the segment mid angles and of the leading edges.
+    Cached because charts only ever use a handful of segment counts.
+    """
+    step = 360 / n
+    idx = np.arange(n)
+    theta_start = start - idx * step - gap / 2
+    theta_end = start - (idx + 1) * step + gap / 2
+    theta1, theta2 = np.minimum(theta_start, theta_end), np.maximum(theta_start, theta_end)
+
+    mid_rad = np.deg2rad((theta1 + theta2) / 2)
+    edge_rad = np.deg2rad(start - idx * step)
+    geom = (theta1, theta2, np.cos(mid_rad), np.sin(mid_rad), np.cos(edge_rad), np.sin(edge_rad))
+    for arr in geom:
+        arr.setflags(write=False)
+    return geom
+
+
+def _ensure_mpl():
+    """
+    Imports matplotlib on first use, so processes that never draw a chart
+    don't pay for it at startup. Also warms the font lookup cache.
+    """
+    global patches, setp, Figure
+    if Figure is not None:
+        return
+    with _MPL_LOCK:
+        if Figure is not None:
+            return
+        import matplotlib.patches as mpl_patches
+        from matplotlib import font_manager as mpl_font_manager
+        from matplotlib.artist import setp as mpl_setp
+        from matplotlib.figure import Figure as MplFigure
+
+        mpl_font_manager.findfont(mpl_font_manager.FontProperties(family='DejaVu Sans'))
+        mpl_font_manager.findfont(mpl_font_manager.FontProperties(family='DejaVu Sans', weight='bold'))
+
+        patches, setp = mpl_patches, mpl_setp
+        Figure = MplFigure
 
 class ChartFactory:
     @staticmethod
-    def _to_base64(fig):
+    def _get_figure(figsize):
+        """
+        Returns a cleared Figure of the given size, reused within the calling thread.
+        """
+        _ensure_mpl()
+        figures = getattr(_FIG_CACHE, 'figures', None)
+        if figures is None:
+            figures = _FIG_CACHE.figures = {}
+        fig = figures.get(figsize)
+        if fig is None:
+            fig = figures[figsize] = Figure(figsize=figsize)
+        else:
+            fig.clear()
+        return fig
+
+    @staticmethod
+    def _to_base64(fig, tight=False):
+        """
+        `tight` fits the saved image to the drawn artists, for charts whose
+        label extent depends on the label text.
+        """
         buf = io.BytesIO()
-        fig.savefig(buf, format='png', bbox_inches='tight')
+        fig.savefig(buf, format='png', bbox_inches='tight' if tight else None,
+                    pil_kwargs={'compress_level': 1, 'optimize': False})
         buf.seek(0)
         img_str = base64.b64encode(buf.read()).decode('utf-8')
-        plt.close(fig)
         return f"data:image/png;base64,{img_str}"
 
+    @staticmethod
+    def _image_to_base64(img):
+        buf = io.BytesIO()
+        img.save(buf, "PNG", optimize=False, compress_level=1)
+        img_str = base64.b64encode(buf.getvalue()).decode('utf-8')
+        return f"data:image/png;base64,{img_str}"
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _bold_font(size):
+        path = _bold_font_path()
+        try:
+            return ImageFont.truetype(path, size) if path else ImageFont.load_default(size=size)
+        except OSError:
+            return ImageFont.load_default(size=size)
+
     @staticmethod
     def generate_bar_chart(labels, scores, color="#4a90e2"):
-        fig, ax = plt.subplots(figsize=(8, 5))
+        fig = ChartFactory._get_figure((8, 5))
+        fig.subplots_adjust(left=0.08, right=0.97, top=0.95, bottom=0.3)
+        ax = fig.subplots()
         bars = ax.bar(labels, scores, color=color, width=0.6)
         
-        plt.xticks(rotation=45, ha='right')
+        setp(ax.get_xticklabels(), rotation=45, ha='right')
 
         for bar in bars:
             height = bar.get_height()
@@ -33,30 +159,33 @@ class ChartFactory:
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
         ax.grid(axis='y', linestyle='--', alpha=0.3)
-        return ChartFactory._to_base64(fig)
+        return ChartFactory._to_base64(fig, tight=True)
 
     @staticmethod
     def generate_radar_chart(categories, values):
         N = len(categories)
-        angles = [n / float(N) * 2 * np.pi for n in range(N)]
-        angles += angles[:1]
+        angles = np.linspace(0, 2 * np.pi, N, endpoint=False)
+        angles_closed = np.append(angles, angles[0])
         values_aug = values + values[:1]
         
-        fig = plt.figure(figsize=(6, 6))
+        fig = ChartFactory._get_figure((6, 6))
+        fig.subplots_adjust(left=0.18, right=0.82, top=0.88, bottom=0.12)
         ax = fig.add_subplot(111, polar=True)
         ax.set_theta_offset(np.pi / 2)
         ax.set_theta_direction(-1)
         
-        plt.xticks(angles[:-1], categories, size=9)
+        ax.set_xticks(angles)
+        ax.set_xticklabels(categories, size=9)
         ax.tick_params(axis='x', pad=20)
         
         ax.set_rlabel_position(0)
-        plt.yticks([25, 50, 75, 100], ["25", "50", "75", ""], color="grey", size=7)
-        plt.ylim(0, 100)
+        ax.set_yticks([25, 50, 75, 100])
+        ax.set_yticklabels(["25", "50", "75", ""], color="grey", size=7)
+        ax.set_ylim(0, 100)
         
-        ax.plot(angles, values_aug, linewidth=2, linestyle='solid', color='#4a90e2')
-        ax.fill(angles, values_aug, color='#4a90e2', alpha=0.1)
-        return ChartFactory._to_base64(fig)
+        ax.plot(angles_closed, values_aug, linewidth=2, linestyle='solid', color='#4a90e2')
+        ax.fill(angles_closed, values_aug, color='#4a90e2', alpha=0.1)
+        return ChartFactory._to_base64(fig, tight=True)
 
     @staticmethod
     def generate_radial_bar_chart(labels, scores):
@@ -69,14 +198,16 @@ class ChartFactory:
         
         sorted_scores, sorted_labels, sorted_colors = zip(*data)
         N = len(sorted_scores)
-        theta = [(x / 100.0) * 2 * np.pi for x in sorted_scores]
+        theta = np.asarray(sorted_scores) / 100.0 * 2 * np.pi
         
         bar_width = 1.0
         gap = 0.1
         inner_radius = 2.0
-        radii = [inner_radius + i * (bar_width + gap) for i in range(N)]
+        radii = inner_radius + np.arange(N) * (bar_width + gap)
         
-        fig, ax = plt.subplots(figsize=(8, 8), subplot_kw={'projection': 'polar'})
+        fig = ChartFactory._get_figure((9, 6))
+        fig.subplots_adjust(left=0.02, right=0.62, top=0.95, bottom=0.05)
+        ax = fig.subplots(subplot_kw={'projection': 'polar'})
         
         ax.set_theta_zero_location("S") 
         ax.set_theta_direction(-1)      
@@ -109,12 +240,13 @@ class ChartFactory:
 
     @staticmethod
     def generate_seven_segment_chart(labels, scores):
-        fig, ax = plt.subplots(figsize=(8, 8))
+        fig = ChartFactory._get_figure((8, 8))
+        fig.subplots_adjust(left=0.02, right=0.98, top=0.98, bottom=0.02)
+        ax = fig.subplots()
         ax.set_aspect('equal')
         ax.axis('off')
 
-        data_points = [{'label': l, 'value': s} for l, s in zip(labels, scores)]
-        num_segments = len(data_points)
+        num_segments = len(scores)
         
         base_colors = [
             '#FF5252', '#FFD600', '#00E676', '#00B0FF',
@@ -125,67 +257,52 @@ class ChartFactory:
         max_radius = 1.0
         start_angle = 90
 
-        for i in range(num_segments):
-            angle_deg = start_angle - (i * (360 / num_segments))
-            angle_rad = np.deg2rad(angle_deg)
-            x_end = max_radius * np.cos(angle_rad)
-            y_end = max_radius * np.sin(angle_rad)
-            ax.plot([0, x_end], [0, y_end], color='black', linewidth=1.5, zorder=10)
+        theta1, theta2, cos_mid, sin_mid, cos_edge, sin_edge = _segment_geom(num_segments, start_angle)
 
-        for i, item in enumerate(data_points):
-            angle_step = 360 / num_segments
-            theta1 = start_angle - ((i + 1) * angle_step)
-            theta2 = start_angle - (i * angle_step)
-            
-            current_radius = (item['value'] / 100.0) * max_radius
-            if current_radius < 0.05: current_radius = 0.05
+        radii = np.maximum(np.asarray(scores, dtype=float) / 100.0 * max_radius, 0.05)
+        text_r = radii * 0.6
+        text_r = np.where(text_r < 0.2, 0.25, text_r)
+        label_r = max_radius * 1.15
 
+        for x_end, y_end in zip(max_radius * cos_edge, max_radius * sin_edge):
+            ax.plot([0, x_end], [0, y_end], color='black', linewidth=1.5, zorder=10)
+
+        for i, (label, value) in enumerate(zip(labels, scores)):
             wedge = patches.Wedge(
                 center=(0, 0),
-                r=current_radius,
-                theta1=theta1,
-                theta2=theta2,
+                r=radii[i],
+                theta1=theta1[i],
+                theta2=theta2[i],
                 facecolor=colors[i],
                 edgecolor=None,
                 linewidth=0
             )
             ax.add_patch(wedge)
 
-            mid_angle_deg = (theta1 + theta2) / 2
-            mid_angle_rad = np.deg2rad(mid_angle_deg)
-
-            text_r = current_radius * 0.6
-            if text_r < 0.2: text_r = 0.25
-            
-            x_text = text_r * np.cos(mid_angle_rad)
-            y_text = text_r * np.sin(mid_angle_rad)
-            
-            ax.text(x_text, y_text, f"{int(item['value'])}%",
+            ax.text(text_r[i] * cos_mid[i], text_r[i] * sin_mid[i], f"{int(value)}%",
                     ha='center', va='center',
                     fontsize=10, fontweight='bold', color='black')
 
-            label_r = max_radius * 1.15
-            label_x = label_r * np.cos(mid_angle_rad)
-            label_y = label_r * np.sin(mid_angle_rad)
-            
-            ax.text(label_x, label_y, item['label'],
+            ax.text(label_r * cos_mid[i], label_r * sin_mid[i], label,
                     ha='center', va='center',
                     fontsize=11, fontweight='bold')
 
-        outer_circle = plt.Circle((0, 0), max_radius, color='black', fill=False, linewidth=2, zorder=10)
+        outer_circle = patches.Circle((0, 0), max_radius, color='black', fill=False, linewidth=2, zorder=10)
         ax.add_patch(outer_circle)
 
         ax.set_xlim(-1.3, 1.3)
         ax.set_ylim(-1.3, 1.3)
         
-        return ChartFactory._to_base64(fig)
+        return ChartFactory._to_base64(fig, tight=True)
 
     @staticmethod
     def generate_variable_radius_chart(labels, scores):
         """
         Generates the Variable Radius Infographic based on provided Logic.
         """
-        fig, ax = plt.subplots(figsize=(8, 8))
+        fig = ChartFactory._get_figure((8, 8))
+        fig.subplots_adjust(left=0.02, right=0.98, top=0.98, bottom=0.02)
+        ax = fig.subplots()
         ax.set_aspect('equal')
         ax.axis('off')
         
@@ -204,24 +321,20 @@ class ChartFactory:
         
         max_value = max(scores) if scores and max(scores) > 0 else 100
 
+        t1s, t2s, cos_mid, sin_mid, _, _ = _segment_geom(num_segments, start_angle, gap_size)
+
+        normalized_height = np.asarray(scores, dtype=float) / max_value
+        rim_radii = np.maximum(inner_void_r + (max_rim_r - inner_void_r) * normalized_height,
+                               inner_void_r + 0.1)
+        value_radii = rim_radii - 0.15
+        value_radii = np.where(value_radii < inner_void_r, inner_void_r + 0.05, value_radii)
+        cat_label_radii = rim_radii + 0.15
+
         for i, (label, value) in enumerate(zip(labels, scores)):
-            angle_step = 360 / num_segments
-            theta_start = start_angle - (i * angle_step) - (gap_size / 2)
-            theta_end = start_angle - ((i + 1) * angle_step) + (gap_size / 2)
-            
-            t1, t2 = min(theta_start, theta_end), max(theta_start, theta_end)
-            
-            mid_angle_deg = (t1 + t2) / 2
-            mid_angle_rad = np.deg2rad(mid_angle_deg)
-            
+            t1, t2 = t1s[i], t2s[i]
             color = base_colors[i % len(base_colors)]
 
-            normalized_height = value / max_value
-            current_rim_r = inner_void_r + (max_rim_r - inner_void_r) * normalized_height
-
-            if current_rim_r < inner_void_r + 0.1: 
-                current_rim_r = inner_void_r + 0.1
-                
+            current_rim_r = rim_radii[i]
             wedge_width = current_rim_r - inner_void_r
 
             shadow_offset_x = 0.02
@@ -250,46 +363,32 @@ class ChartFactory:
             )
             ax.add_patch(full_wedge)
 
-            label_r = current_rim_r - 0.15 
-            if label_r < inner_void_r: label_r = inner_void_r + 0.05
-            
-            x_text = label_r * np.cos(mid_angle_rad)
-            y_text = label_r * np.sin(mid_angle_rad)
-
-            ax.text(x_text, y_text, f"{int(value)}%", 
+            ax.text(value_radii[i] * cos_mid[i], value_radii[i] * sin_mid[i], f"{int(value)}%", 
                     ha='center', va='center', 
                     fontsize=12, fontweight='bold', color='white')
 
-            cat_label_r = current_rim_r + 0.15
-            x_label = cat_label_r * np.cos(mid_angle_rad)
-            y_label = cat_label_r * np.sin(mid_angle_rad)
-
-            ha = 'center'
-            norm_angle = mid_angle_deg % 360
-            if 0 <= norm_angle < 90 or 270 <= norm_angle < 360:
-                ha = 'left' if x_label > 0 else 'right'
-            else:
-                ha = 'right' if x_label < 0 else 'left'
-
-            ax.text(x_label, y_label, label, 
+            ax.text(cat_label_radii[i] * cos_mid[i], cat_label_radii[i] * sin_mid[i], label, 
                     ha='center', va='center', 
                     fontsize=10, fontweight='bold', color='#333333')
 
         return ChartFactory._to_base64(fig)
 
     @staticmethod
-    def generate_vark_circles(scores, labels, descriptions=None):
+    def _vark_template():
         """
-        Generates the VARK circle chart.
-        Args:
-            scores: List of scores.
-            labels: List of labels.
-            descriptions: (Optional) List of 4 strings generated by LLM. 
-                          Order MUST be [Visual, Auditory, Read/Write, Kinesthetic].
-                          If None, defaults to static definitions.
+        Returns this thread's VARK Figure and its four description Text artists.
+        Circles, arcs and titles never change, so they are drawn once and only
+        the descriptions are replaced per call.
         """
+        template = getattr(_FIG_CACHE, 'vark', None)
+        if template is not None:
+            return template
+
+        _ensure_mpl()
         bg_color = 'white'
-        fig, ax = plt.subplots(figsize=(8, 8))
+        fig = Figure(figsize=(8, 8))
+        fig.subplots_adjust(left=0.02, right=0.98, top=0.98, bottom=0.02)
+        ax = fig.subplots()
         
         fig.patch.set_facecolor(bg_color)
         ax.set_facecolor(bg_color)
@@ -299,44 +398,8 @@ class ChartFactory:
         ax.axis('off')
 
         radius = 1.0 
-        
-        default_descs = [
-            'Visual learners prefer information presented in a visual format like graphs, charts, or diagrams.',
-            'Auditory learners learn best through listening and verbal instructions.',
-            'Reading/Writing learners excel when information is presented in written form, such as reading textbooks.',
-            'Kinesthetic learners learn by doing and prefer hands-on activities or practical experiences.'
-        ]
-        
-        if descriptions and len(descriptions) == 4:
-            final_descs = descriptions
-        else:
-            final_descs = default_descs
-
-        vark_data = [
-            {
-                'letter': 'V', 'title': 'Visual', 'color': '#FFF1A8', 
-                'center': (-1, 1), 'highlight_angle': (90, 180), 
-                'desc': final_descs[0]
-            },
-            {
-                'letter': 'A', 'title': 'Auditory', 'color': '#C8F0A8', 
-                'center': (1, 1), 'highlight_angle': (0, 90), 
-                'desc': final_descs[1]
-            },
-            {
-                'letter': 'R', 'title': 'Reading / Writing', 'color': '#8CCAF2', 
-                'center': (-1, -1), 'highlight_angle': (180, 270), 
-                'desc': final_descs[2]
-            },
-            {
-                'letter': 'K', 'title': 'Kinesthetic', 'color': '#D69EF5', 
-                'center': (1, -1), 'highlight_angle': (270, 360), 
-                'desc': final_descs[3]
-            }
-        ]
-
-        
-        for item in vark_data:
+        desc_texts = []
+        for item in _VARK_LAYOUT:
             cx, cy = item['center']
             
             circle = patches.Circle((cx, cy), radius, facecolor=item['color'], edgecolor='none', zorder=1)
@@ -351,13 +414,39 @@ class ChartFactory:
             ax.text(cx, cy + 0.4, item['letter'], ha='center', va='center', fontsize=65, fontweight='bold', color='#333333', zorder=3)
             ax.text(cx, cy - 0.1, item['title'], ha='center', va='center', fontsize=11, fontweight='bold', color='#333333', zorder=3)
             
-            wrapped_desc = textwrap.fill(item['desc'], width=28)
-            ax.text(cx, cy - 0.5, wrapped_desc, ha='center', va='center', fontsize=7, color='#333333', zorder=3, linespacing=1.3)
+            desc_texts.append(ax.text(cx, cy - 0.5, '', ha='center', va='center', fontsize=7, color='#333333', zorder=3, linespacing=1.3))
+
+        template = _FIG_CACHE.vark = (fig, desc_texts)
+        return template
+
+    @staticmethod
+    def generate_vark_circles(scores, labels, descriptions=None):
+        """
+        Generates the VARK circle chart.
+        Args:
+            scores: List of scores.
+            labels: List of labels.
+            descriptions: (Optional) List of 4 strings generated by LLM. 
+                          Order MUST be [Visual, Auditory, Read/Write, Kinesthetic].
+                          If None, defaults to static definitions.
+        """
+        if descriptions and len(descriptions) == 4:
+            final_descs = [textwrap.fill(d, width=28) for d in descriptions]
+        else:
+            final_descs = _VARK_DEFAULT_WRAPPED
+
+        fig, desc_texts = ChartFactory._vark_template()
+        for text, desc in zip(desc_texts, final_descs):
+            text.set_text(desc)
 
         return ChartFactory._to_base64(fig)
 
     @staticmethod
     def generate_gauge(value, min_val=0, max_val=100):
+        """
+        Draws the employability gauge directly with Pillow. The chart is only
+        a few flat shapes, so matplotlib's figure/artist setup is skipped.
+        """
         bg_color = "white"
         c_red = "#e84e1b"
         c_yellow = "#f2c037"
@@ -365,47 +454,56 @@ class ChartFactory:
         c_d_green = "#369b46"
         c_needle = "#1a1a1a"
 
-        fig, ax = plt.subplots(figsize=(6, 5), facecolor=bg_color)
-        ax.set_facecolor(bg_color)
+        supersample = 2
+        unit = 220 * supersample
+        width, height = int(2.1 * unit), int(2.05 * unit)
+        cx, cy = width / 2, 1.05 * unit
+
+        def to_px(x, y):
+            return (cx + x * unit, cy - y * unit)
+
+        img = Image.new("RGB", (width, height), bg_color)
+        draw = ImageDraw.Draw(img)
 
-        sizes = [67.5, 67.5, 67.5, 67.5, 90] 
+        sizes = [67.5, 67.5, 67.5, 67.5, 90]
         colors = [c_d_green, c_l_green, c_yellow, c_red, bg_color]
-        
-        wedges, _ = ax.pie(
-            sizes, 
-            colors=colors, 
-            startangle=-45, 
-            counterclock=True, 
-            radius=1.0,
-            wedgeprops={'width': 0.35, 'edgecolor': bg_color, 'linewidth': 4} 
-        )
+        outer_r = 1.0
+        inner_r = 0.65
+
+        start = -45
+        for size, color in zip(sizes, colors):
+            draw.pieslice([to_px(-outer_r, outer_r), to_px(outer_r, -outer_r)],
+                          -(start + size), -start, fill=color)
+            start += size
+        draw.ellipse([to_px(-inner_r, inner_r), to_px(inner_r, -inner_r)], fill=bg_color)
+
+        gap_width = int(0.035 * unit)
+        start = -45
+        for size in sizes:
+            edge = np.deg2rad(start)
+            draw.line([to_px(inner_r * np.cos(edge), inner_r * np.sin(edge)),
+                       to_px(1.02 * np.cos(edge), 1.02 * np.sin(edge))],
+                      fill=bg_color, width=gap_width)
+            start += size
 
         total_span = 270
         start_angle = 225
         angle_deg = start_angle - (total_span * (value - min_val) / (max_val - min_val))
         angle_rad = np.deg2rad(angle_deg)
-        
+
         needle_length = 0.55
         needle_width = 0.08
-        
-        x_tip = needle_length * np.cos(angle_rad)
-        y_tip = needle_length * np.sin(angle_rad)
-        x_base_l = needle_width * np.cos(angle_rad + np.pi/2)
-        y_base_l = needle_width * np.sin(angle_rad + np.pi/2)
-        x_base_r = needle_width * np.cos(angle_rad - np.pi/2)
-        y_base_r = needle_width * np.sin(angle_rad - np.pi/2)
-        
-        needle_poly = patches.Polygon(
-            [[x_tip, y_tip], [x_base_l, y_base_l], [x_base_r, y_base_r]], 
-            closed=True, color=c_needle, zorder=10
-        )
-        ax.add_patch(needle_poly)
-        ax.add_patch(plt.Circle((0, 0), needle_width, color=c_needle, zorder=11))
 
-        ax.text(0, -0.65, f"{value}", ha='center', va='center', fontsize=45, fontweight='bold', color='black')
+        needle_poly = [
+            to_px(needle_length * np.cos(angle_rad), needle_length * np.sin(angle_rad)),
+            to_px(needle_width * np.cos(angle_rad + np.pi/2), needle_width * np.sin(angle_rad + np.pi/2)),
+            to_px(needle_width * np.cos(angle_rad - np.pi/2), needle_width * np.sin(angle_rad - np.pi/2)),
+        ]
+        draw.polygon(needle_poly, fill=c_needle)
+        draw.ellipse([to_px(-needle_width, needle_width), to_px(needle_width, -needle_width)], fill=c_needle)
 
+        font = ChartFactory._bold_font(int(0.36 * unit))
+        draw.text(to_px(0, -0.65), f"{value}", fill="black", font=font, anchor="mm")
 
-        ax.set_aspect('equal')
-        plt.axis('off')
-        
-        return ChartFactory._to_base64(fig)
\ No newline at end of file
+        img = img.resize((width // supersample, height // supersample), Image.LANCZOS)
+        return ChartFactory._image_to_base64(img)
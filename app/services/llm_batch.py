@@ -0,0 +1,72 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+
+class BatchedLLMClient:
+    """
+    Collects prompts for a short window and dispatches them together.
+
+    A batch is flushed after `window_ms` or once `max_batch` prompts are
+    queued. Identical (provider, system prompt, prompt) requests within a
+    batch share a single provider call; distinct ones are sent concurrently.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, str, Optional[str]], Awaitable[str]],
+        window_ms: int = 200,
+        max_batch: int = 64
+    ):
+        self._send = send
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._queue = None
+        self._worker = None
+        self._flushes = set()
+
+    async def submit(self, prompt: str, provider: str, system_prompt: Optional[str] = None) -> str:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((provider, system_prompt, prompt), future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._window
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            flush = asyncio.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch):
+        waiters = {}
+        for key, future in batch:
+            waiters.setdefault(key, []).append(future)
+
+        keys = list(waiters)
+        results = await asyncio.gather(
+            *[self._send(prompt, provider, system_prompt) for provider, system_prompt, prompt in keys],
+            return_exceptions=True
+        )
+
+        for key, result in zip(keys, results):
+            for future in waiters[key]:
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
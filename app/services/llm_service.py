@@ -1,73 +1,405 @@
-import json
 import asyncio
+import hashlib
+import random
+import re
+import httpx
+import orjson
 import google.generativeai as genai
-from openai import AsyncOpenAI
+import redis.asyncio as aioredis
+from cachetools import TTLCache
+from openai import APIConnectionError, AsyncOpenAI
 from fastapi import HTTPException, status
+from typing import Callable, Optional
 
 from app.core.config import settings
 from app.core.logging_config import app_logger
 from app.models.psychometric import (
     StudentDetailsInput,
+    AIAnalysisOutput,
     AIAnalysisResult,
+    ProcessedSection,
     ProcessedTest,
+    VarkOutput,
 )
 from app.services.chart_factory import ChartFactory
+from app.services.llm_batch import BatchedLLMClient
+from app.services.semantic_cache import SemanticCache
 
 
+SYSTEM_PROMPT_MAIN = """
+### ROLE & OBJECTIVE
+You are an Elite Career Strategist and Lead Psychometrician with 20+ years of experience in corporate talent acquisition.
+Your task is to analyze a student's psychometric portfolio to determine their **Real-World Employability**.
+
+### ANALYSIS GUIDELINES
+1. **Synthesis:** Do not just read individual scores. Look for patterns (e.g., High Technical Aptitude + Low Social Skills = "Back-end Specialist" vs. High Technical + High Social = "Product Manager").
+2. **Honesty:** Be critical. If soft skills (Resilience, Collaboration) are low, the Employability Score MUST reflect that risk, even if technical scores are perfect.
+3. **Market Relevance:** Recommend roles and certifications that are currently in demand and match the specific "Course" and "Institution" context provided.
+
+### SCORING RUBRIC (Employability Score 0-100)
+- **90-100 (Top Tier):** Exceptional balance of hard & soft skills. Ready for FAANG/MNC leadership tracks.
+- **75-89 (Strong):** Solid candidate with minor, fixable gaps. Good for standard corporate roles.
+- **60-74 (Average):** Functional but requires significant training. Risky for high-pressure roles.
+- **<60 (At Risk):** Major red flags in critical areas (e.g., resilience, teamwork). Needs immediate intervention.
+
+### OUTPUT JSON REQUIREMENTS
+- **strengths:** Synthesize **all** key patterns into 1-2 comprehensive sentences, one per list item. Ensure you capture both technical dominance and positive behavioral traits without omitting major assets.
+- **development_areas:** Synthesize **all** critical risks and gaps into 1-2 comprehensive sentences, one per list item. Combine related issues (e.g., linking "poor delegation" with "sprint management struggles") to provide a complete picture of risk.
+- **recommended_roles:** List 3 concrete job titles (e.g., "DevOps Engineer," "Technical Lead").
+- **certifications:** List 3 specific, recognized certifications that fill their specific gaps or boost their strengths (e.g., "AWS Certified Solutions Architect," "Scrum Master CSM").
+- **employability_text:** A professional, 3-sentence executive summary suitable for a hiring manager to read. Focus on the *net value* of the candidate.
+
+### STRICT JSON OUTPUT FORMAT
+{
+  "strengths": ["string"],
+  "development_areas": ["string"],
+  "recommended_roles": ["string", "string", "string"],
+  "certifications": ["string", "string", "string"],
+  "employability_score": integer,
+  "employability_text": "string"
+}
+"""
+
+SYSTEM_PROMPT_VARK = """
+You are an expert Educational Psychologist.
+You will receive a student's VARK RESULTS.
+Generate 4 simple sentences (Visual, Auditory, Read/Write, Kinesthetic) explaining how this student learns best.
+Order: [Visual, Auditory, Read/Write, Kinesthetic]
+Output JSON: { "vark_descriptions": ["string", "string", "string", "string"] }
+"""
+
+MAIN_PROMPT_PREFIX = "### INPUT PROFILE\n"
+VARK_PROMPT_PREFIX = "VARK RESULTS:\n"
+PROMPT_SUFFIX = "\n"
+
+_OUTPUT_MODELS = {
+    SYSTEM_PROMPT_MAIN: AIAnalysisOutput,
+    SYSTEM_PROMPT_VARK: VarkOutput,
+}
+
+
+def _json_schema_format(output_model: type) -> dict:
+    """
+    Strict json_schema response_format, so the provider constrains decoding
+    to valid, complete JSON of the expected shape.
+    """
+    schema = output_model.model_json_schema()
+    schema["additionalProperties"] = False
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": output_model.__name__, "schema": schema, "strict": True},
+    }
+
+
+_RESPONSE_FORMATS = {
+    system_prompt: _json_schema_format(output_model)
+    for system_prompt, output_model in _OUTPUT_MODELS.items()
+}
+
+
+gemini_models = {}
 if settings.GEMINI_API_KEY:
     genai.configure(api_key=settings.GEMINI_API_KEY)
-    gemini_model = genai.GenerativeModel(settings.GEMINI_MODEL_NAME)
-else:
-    gemini_model = None
+    gemini_models = {
+        system_prompt: genai.GenerativeModel(settings.GEMINI_MODEL_NAME, system_instruction=system_prompt)
+        for system_prompt in (None, SYSTEM_PROMPT_MAIN, SYSTEM_PROMPT_VARK)
+    }
+
+llm_http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(60.0, connect=5.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    http2=True
+)
 
 openai_client = None
 if settings.OPENAI_API_KEY:
-    openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    openai_client = AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=llm_http_client,
+        max_retries=0
+    )
 
 deepseek_client = None
 if settings.DEEPSEEK_API_KEY:
     deepseek_client = AsyncOpenAI(
         api_key=settings.DEEPSEEK_API_KEY, 
-        base_url="https://api.deepseek.com"
+        base_url="https://api.deepseek.com",
+        http_client=llm_http_client,
+        max_retries=0
     )
 
+redis_client = None
+if settings.REDIS_URL:
+    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
 
-async def _get_llm_response(prompt: str, model_provider: str) -> str:
-    try:
-        if model_provider == "gemini":
-            if not gemini_model:
-                raise ValueError("Gemini API Key missing")
-            response = await gemini_model.generate_content_async(
-                prompt, generation_config={"response_mime_type": "application/json"}
+_llm_cache = TTLCache(maxsize=512, ttl=settings.LLM_CACHE_TTL_SECONDS)
+
+semantic_cache = SemanticCache(
+    tolerance=settings.SEMANTIC_CACHE_TOLERANCE,
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES
+)
+
+_MODEL_NAMES = {
+    "gemini": settings.GEMINI_MODEL_NAME,
+    "openai": settings.OPENAI_MODEL_NAME,
+    "deepseek": settings.DEEPSEEK_MODEL_NAME,
+}
+
+
+def _chat_messages(prompt: str, system_prompt: Optional[str]) -> list[dict]:
+    messages = [{"role": "user", "content": prompt}]
+    if system_prompt:
+        messages.insert(0, {"role": "system", "content": system_prompt})
+    return messages
+
+
+async def _collect_stream(stream, on_partial: Callable[[str], None]) -> str:
+    parts = []
+    async for text in stream:
+        if text:
+            parts.append(text)
+            on_partial(text)
+    return "".join(parts)
+
+
+async def _chat_completion(
+    client: AsyncOpenAI,
+    model_name: str,
+    prompt: str,
+    system_prompt: Optional[str],
+    on_partial: Optional[Callable[[str], None]],
+    response_format: dict
+) -> str:
+    response = await client.chat.completions.create(
+        model=model_name,
+        messages=_chat_messages(prompt, system_prompt),
+        response_format=response_format,
+        stream=on_partial is not None,
+    )
+    if on_partial is None:
+        return response.choices[0].message.content
+    return await _collect_stream(
+        (chunk.choices[0].delta.content async for chunk in response if chunk.choices),
+        on_partial
+    )
+
+
+async def _call_provider(
+    prompt: str,
+    model_provider: str,
+    system_prompt: Optional[str],
+    on_partial: Optional[Callable[[str], None]]
+) -> str:
+    if model_provider == "gemini":
+        if not gemini_models:
+            raise ValueError("Gemini API Key missing")
+        model = gemini_models.get(system_prompt)
+        if model is None:
+            model = gemini_models[system_prompt] = genai.GenerativeModel(
+                settings.GEMINI_MODEL_NAME, system_instruction=system_prompt
             )
+        generation_config = {"response_mime_type": "application/json"}
+        if system_prompt in _OUTPUT_MODELS:
+            generation_config["response_schema"] = _OUTPUT_MODELS[system_prompt]
+        response = await model.generate_content_async(
+            prompt,
+            generation_config=generation_config,
+            stream=on_partial is not None,
+        )
+        if on_partial is None:
             return response.text
+        # chunk.text raises on chunks without parts (e.g. a trailing finish-reason-only chunk).
+        return await _collect_stream(
+            (part.text async for chunk in response if chunk.candidates
+             for part in chunk.candidates[0].content.parts if "text" in part),
+            on_partial
+        )
+
+    elif model_provider == "openai":
+        if not openai_client:
+            raise ValueError("OpenAI API Key missing")
+        return await _chat_completion(
+            openai_client, settings.OPENAI_MODEL_NAME, prompt, system_prompt, on_partial,
+            _RESPONSE_FORMATS.get(system_prompt, {"type": "json_object"})
+        )
+
+    elif model_provider == "deepseek":
+        if not deepseek_client:
+            raise ValueError("DeepSeek API Key missing")
+        return await _chat_completion(
+            deepseek_client, settings.DEEPSEEK_MODEL_NAME, prompt, system_prompt, on_partial,
+            {"type": "json_object"}
+        )
+    else:
+        raise ValueError(f"Unknown model provider: {model_provider}")
 
-        elif model_provider == "openai":
-            if not openai_client:
-                raise ValueError("OpenAI API Key missing")
-            response = await openai_client.chat.completions.create(
-                model=settings.OPENAI_MODEL_NAME,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-            )
-            return response.choices[0].message.content
-
-        elif model_provider == "deepseek":
-            if not deepseek_client:
-                raise ValueError("DeepSeek API Key missing")
-            response = await deepseek_client.chat.completions.create(
-                model=settings.DEEPSEEK_MODEL_NAME, 
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-            )
-            return response.choices[0].message.content
-        else:
-            raise ValueError(f"Unknown model provider: {model_provider}")
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_provider_semaphores = {
+    provider: asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    for provider in ("gemini", "openai", "deepseek")
+}
+
+
+def _is_retryable(e: Exception) -> bool:
+    """Rate limits, provider 5xx and dropped connections are worth another try."""
+    if isinstance(e, APIConnectionError):
+        return True
+    status_code = getattr(e, "status_code", None) or getattr(e, "code", None)
+    return status_code in _RETRY_STATUSES
+
+
+async def _get_llm_response(
+    prompt: str,
+    model_provider: str,
+    system_prompt: Optional[str] = None,
+    on_partial: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Sends `prompt` as the user turn. The static `system_prompt` goes first and
+    byte-identical on every call so provider-side prompt caching can reuse it.
+    When `on_partial` is given the response is streamed and each text chunk is
+    passed to it as it arrives; the full text is still returned.
+    At most LLM_MAX_CONCURRENCY calls per provider are in flight; rate-limit
+    and 5xx errors are retried with jittered exponential backoff. This is the
+    only retry layer: the OpenAI SDK clients are built with max_retries=0.
+    """
+    semaphore = _provider_semaphores.get(model_provider)
+    try:
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            try:
+                if semaphore is None:
+                    return await _call_provider(prompt, model_provider, system_prompt, on_partial)
+                async with semaphore:
+                    return await _call_provider(prompt, model_provider, system_prompt, on_partial)
+            except Exception as e:
+                if attempt == settings.LLM_MAX_RETRIES or not _is_retryable(e):
+                    raise
+                delay = settings.LLM_RETRY_BASE_SECONDS * 2 ** attempt * (0.5 + random.random())
+                app_logger.warning(f"LLM call to {model_provider} failed ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
     except Exception as e:
         app_logger.error(f"LLM Error: {e}")
         raise e
 
 
+batched_client = None
+if settings.ENABLE_BATCH:
+    batched_client = BatchedLLMClient(
+        _get_llm_response,
+        window_ms=settings.BATCH_WINDOW_MS,
+        max_batch=settings.BATCH_MAX_SIZE
+    )
+
+
+def _llm_cache_key(prompt: str, model_provider: str, system_prompt: Optional[str]) -> str:
+    model_name = _MODEL_NAMES.get(model_provider, "")
+    digest = hashlib.sha256(
+        f"{model_provider}\0{model_name}\0{system_prompt or ''}\0{prompt}".encode()
+    ).hexdigest()
+    return f"llm:{digest}"
+
+
+async def _get_cached_llm_response(
+    prompt: str,
+    model_provider: str,
+    system_prompt: Optional[str] = None,
+    on_partial: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Same as _get_llm_response, but identical prompts for the same provider/model
+    are answered from an in-process cache, backed by Redis when REDIS_URL is set.
+    Only responses that parse as JSON are cached. Batched calls are not streamed,
+    so `on_partial` only fires on the direct path.
+    """
+    key = _llm_cache_key(prompt, model_provider, system_prompt)
+
+    cached = _llm_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if redis_client:
+        try:
+            cached = await redis_client.get(key)
+        except Exception as e:
+            app_logger.error(f"LLM cache read failed: {e}")
+        if cached is not None:
+            _llm_cache[key] = cached
+            return cached
+
+    if batched_client:
+        response = await batched_client.submit(prompt, model_provider, system_prompt)
+    else:
+        response = await _get_llm_response(prompt, model_provider, system_prompt, on_partial)
+
+    try:
+        orjson.loads(response)
+    except (TypeError, ValueError):
+        return response
+
+    _llm_cache[key] = response
+    if redis_client:
+        try:
+            await redis_client.setex(key, settings.LLM_CACHE_TTL_SECONDS, response)
+        except Exception as e:
+            app_logger.error(f"LLM cache write failed: {e}")
+    return response
+
+
+async def _get_main_analysis(
+    prompt: str,
+    provider: str,
+    bucket: tuple,
+    scores: list[float],
+    on_partial: Optional[Callable[[str], None]] = None
+) -> tuple[str, bool]:
+    """Returns (response, served_from_semantic_cache)."""
+    cached = semantic_cache.get(bucket, scores)
+    if cached is not None:
+        app_logger.info("Main analysis served from semantic cache")
+        return cached, True
+    return await _get_cached_llm_response(prompt, provider, SYSTEM_PROMPT_MAIN, on_partial), False
+
+
+_SCORE_RE = re.compile(r'"employability_score"\s*:\s*(\d+)\s*[,}\n]')
+
+
+class _EarlyGauge:
+    """
+    Watches a streamed main analysis and starts rendering the gauge as soon as
+    `employability_score` has been generated, while the rest is still arriving.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self.score = None
+        self.task = None
+
+    def __call__(self, chunk: str) -> None:
+        if self.task is not None:
+            return
+        self._text += chunk
+        match = _SCORE_RE.search(self._text)
+        if match:
+            self.score = int(match.group(1))
+            self.task = asyncio.ensure_future(asyncio.to_thread(ChartFactory.generate_gauge, self.score))
+
+    def result_for(self, score):
+        """The early render if it used `score`, otherwise a fresh one."""
+        if self.task is not None and self.score == score:
+            return self.task
+        self.cancel()
+        return asyncio.to_thread(ChartFactory.generate_gauge, score)
+
+    def cancel(self) -> None:
+        """Drops the early render, retrieving its outcome so a failure is not reported as unhandled."""
+        if self.task is not None:
+            self.task.cancel()
+            self.task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self.task = None
+
+
 async def _generate_vark_details(test: ProcessedTest, provider: str) -> list[str]:
     """
     Generates VARK descriptions.
@@ -84,131 +416,165 @@ async def _generate_vark_details(test: ProcessedTest, provider: str) -> list[str
 
     score_summary = "\n".join(lines)
 
-    prompt = f"""
-You are an expert Educational Psychologist.
-VARK RESULTS:
-{score_summary}
-
-Generate 4 simple sentences (Visual, Auditory, Read/Write, Kinesthetic) explaining how this student learns best.
-Order: [Visual, Auditory, Read/Write, Kinesthetic]
-Output JSON: {{ "vark_descriptions": ["string", "string", "string", "string"] }}
-"""
+    prompt = f"{VARK_PROMPT_PREFIX}{score_summary}{PROMPT_SUFFIX}"
     try:
-        json_str = await _get_llm_response(prompt, provider)
-        result = json.loads(json_str)
+        json_str = await _get_cached_llm_response(prompt, provider, SYSTEM_PROMPT_VARK)
+        result = orjson.loads(json_str)
         return result.get("vark_descriptions", [])
     except Exception as e:
         app_logger.error(f"VARK Error: {e}")
         return []
 
 
-async def generate_ai_analysis(
+def _section_line(sec: ProcessedSection, max_chars: Optional[int] = None) -> str:
+    interp = sec.interpretation
+    if interp and max_chars and len(interp) > max_chars:
+        interp = interp[:max_chars].rstrip() + "..."
+    line = f"- {sec.section}: {sec.score_percentage}%"
+    return f"{line}\n  Interpretation: {interp}" if interp else line
+
+
+def _build_summary_text(
     data: StudentDetailsInput,
-    processed_tests: list[ProcessedTest]
-) -> AIAnalysisResult:
-    
+    processed_tests: list[ProcessedTest],
+    keep: Optional[set] = None,
+    max_chars: Optional[int] = None
+) -> str:
+    """
+    Formats the student profile for the prompt. With `keep`, only sections
+    whose id() is in it are listed. The student's name is left out while the
+    semantic cache is on, since its answers are shared between students.
+    """
     summary_lines = [
-        f"Student Name: {data.student_name}",
         f"Course: {data.course_name}",
         "--- PSYCHOMETRIC TEST RESULTS ---",
     ]
-
-    total_score = 0
-    count = 0
-    fifth_key_test = None
+    if not semantic_cache.enabled:
+        summary_lines.insert(0, f"Student Name: {data.student_name}")
 
     if not processed_tests:
         summary_lines.append("No data available.")
-    else:
-        for test in processed_tests:
-            if test.key_name == 'fifth':
-                fifth_key_test = test
-
-            summary_lines.append(f"\nTest: {test.test_name}")
-            if test.description:
-                summary_lines.append(f"Description: {test.description}")
-            
-            for sec in test.sections:
-                summary_lines.append(f"- {sec.section}: {sec.score_percentage}%")
-                if sec.interpretation:
-                    summary_lines.append(f"  Interpretation: {sec.interpretation}")
-                total_score += sec.score_percentage
-                count += 1
-    
-    summary_text = "\n".join(summary_lines)
-    raw_avg = int(total_score / max(count, 1))
 
-    main_prompt = f"""
-    
-### ROLE & OBJECTIVE
-You are an Elite Career Strategist and Lead Psychometrician with 20+ years of experience in corporate talent acquisition.
-Your task is to analyze a student's psychometric portfolio to determine their **Real-World Employability**.
+    for test in processed_tests:
+        summary_lines.append(f"\nTest: {test.test_name}")
+        if test.description:
+            summary_lines.append(f"Description: {test.description}")
 
-### INPUT PROFILE
-{summary_text}
+        sections = test.sections
+        if keep is not None:
+            sections = [sec for sec in sections if id(sec) in keep]
+        if sections:
+            summary_lines.append("\n".join(_section_line(sec, max_chars) for sec in sections))
 
-### ANALYSIS GUIDELINES
-1. **Synthesis:** Do not just read individual scores. Look for patterns (e.g., High Technical Aptitude + Low Social Skills = "Back-end Specialist" vs. High Technical + High Social = "Product Manager").
-2. **Honesty:** Be critical. If soft skills (Resilience, Collaboration) are low, the Employability Score MUST reflect that risk, even if technical scores are perfect.
-3. **Market Relevance:** Recommend roles and certifications that are currently in demand and match the specific "Course" and "Institution" context provided.
+    return "\n".join(summary_lines)
 
-### SCORING RUBRIC (Employability Score 0-100)
-- **90-100 (Top Tier):** Exceptional balance of hard & soft skills. Ready for FAANG/MNC leadership tracks.
-- **75-89 (Strong):** Solid candidate with minor, fixable gaps. Good for standard corporate roles.
-- **60-74 (Average):** Functional but requires significant training. Risky for high-pressure roles.
-- **<60 (At Risk):** Major red flags in critical areas (e.g., resilience, teamwork). Needs immediate intervention.
 
-### OUTPUT JSON REQUIREMENTS
-- **strengths:** Synthesize **all** key patterns into 1-2 comprehensive sentences. Ensure you capture both technical dominance and positive behavioral traits without omitting major assets.
-- **development_areas:** Synthesize **all** critical risks and gaps into 1-2 comprehensive sentences. Combine related issues (e.g., linking "poor delegation" with "sprint management struggles") to provide a complete picture of risk.
-- **recommended_roles:** List 3 concrete job titles (e.g., "DevOps Engineer," "Technical Lead").
-- **certifications:** List 3 specific, recognized certifications that fill their specific gaps or boost their strengths (e.g., "AWS Certified Solutions Architect," "Scrum Master CSM").
-- **employability_text:** A professional, 3-sentence executive summary suitable for a hiring manager to read. Focus on the *net value* of the candidate.
+def _compress_summary(
+    data: StudentDetailsInput,
+    processed_tests: list[ProcessedTest],
+    budget: int
+) -> str:
+    """
+    Fits the profile into roughly `budget` tokens (~4 chars each): interpretations
+    are truncated and sections are kept in order of distance from 50%, so the
+    least informative, middling scores are dropped first.
+    """
+    max_chars = settings.SUMMARY_INTERPRETATION_CHARS
+    ranked = sorted(
+        (sec for t in processed_tests for sec in t.sections),
+        key=lambda sec: abs(sec.score_percentage - 50),
+        reverse=True
+    )
 
-### STRICT JSON OUTPUT FORMAT
-{{
-  "strengths": "string",
-  "development_areas": "string",
-  "recommended_roles": ["string", "string", "string"],
-  "certifications": ["string", "string", "string"],
-  "employability_score": integer,
-  "employability_text": "string"
-}}
-"""
+    keep = set()
+    used = len(_build_summary_text(data, processed_tests, keep, max_chars))
+    for sec in ranked:
+        cost = len(_section_line(sec, max_chars)) + 1
+        if used + cost > budget * 4:
+            break
+        keep.add(id(sec))
+        used += cost
+
+    app_logger.info(f"Summary compressed to {len(keep)} of {len(ranked)} sections")
+    return _build_summary_text(data, processed_tests, keep, max_chars)
+
+
+def _as_list(value) -> list:
+    return [value] if isinstance(value, str) else value
 
+
+async def generate_ai_analysis(
+    data: StudentDetailsInput,
+    processed_tests: list[ProcessedTest]
+) -> AIAnalysisResult:
+    
+    tests_by_key = {t.key_name: t for t in processed_tests}
+    fifth_key_test = tests_by_key.get('fifth')
+
+    all_scores = [sec.score_percentage for t in processed_tests for sec in t.sections]
+    raw_avg = int(sum(all_scores) / max(len(all_scores), 1))
+
+    summary_text = _build_summary_text(data, processed_tests)
+    budget = settings.MAX_SUMMARY_TOKENS
+    if budget and len(summary_text) // 4 > budget:
+        summary_text = _compress_summary(data, processed_tests, budget)
+
+    main_prompt = f"{MAIN_PROMPT_PREFIX}{summary_text}{PROMPT_SUFFIX}"
+
+    early_gauge = _EarlyGauge()
     try:
         provider = getattr(data, 'model', 'gemini').lower()
         
-        main_task = _get_llm_response(main_prompt, provider)
+        profile_bucket = (
+            provider,
+            _MODEL_NAMES.get(provider, ""),
+            data.course_name,
+            tuple((t.test_name, s.section) for t in processed_tests for s in t.sections),
+        )
+        profile_scores = all_scores
+
+        main_task = _get_main_analysis(
+            main_prompt, provider, profile_bucket, profile_scores, on_partial=early_gauge
+        )
         
         vark_task = None
         if fifth_key_test:
             vark_task = _generate_vark_details(fifth_key_test, provider)
 
         if vark_task:
-            main_resp_str, vark_descs = await asyncio.gather(main_task, vark_task)
+            (main_resp_str, from_semantic_cache), vark_descs = await asyncio.gather(main_task, vark_task)
         else:
-            main_resp_str = await main_task
+            main_resp_str, from_semantic_cache = await main_task
             vark_descs = []
 
-        result_json = json.loads(main_resp_str)
-        employability_score = result_json.get("employability_score", raw_avg)
-
-        if fifth_key_test and vark_descs and len(vark_descs) == 4:
-            scores = [s.score_percentage for s in fifth_key_test.sections]
-            labels = [s.section for s in fifth_key_test.sections]
-            updated_vark = ChartFactory.generate_vark_circles(scores, labels, descriptions=vark_descs)
-            fifth_key_test.charts['vark_circles'] = updated_vark
+        result_json = orjson.loads(main_resp_str)
+        if from_semantic_cache:
+            # The stored analysis belongs to a similar profile; score this student on their own numbers.
+            employability_score = raw_avg
+        else:
+            semantic_cache.put(profile_bucket, profile_scores, main_resp_str)
+            employability_score = result_json.get("employability_score", raw_avg)
 
     except Exception as e:
+        early_gauge.cancel()
         app_logger.error(f"Analysis Failed: {e}")
         raise HTTPException(status_code=502, detail="AI Analysis Failed")
 
-    employability_gauge = ChartFactory.generate_gauge(employability_score)
+    chart_jobs = [early_gauge.result_for(employability_score)]
+    if fifth_key_test and vark_descs and len(vark_descs) == 4:
+        chart_jobs.append(asyncio.to_thread(
+            ChartFactory.generate_vark_circles,
+            [s.score_percentage for s in fifth_key_test.sections],
+            [s.section for s in fifth_key_test.sections],
+            vark_descs
+        ))
+    employability_gauge, *vark_chart = await asyncio.gather(*chart_jobs)
+    if vark_chart:
+        fifth_key_test.charts['vark_circles'] = vark_chart[0]
 
     return AIAnalysisResult(
-        strengths=result_json.get("strengths", []),
-        development_areas=result_json.get("development_areas", []),
+        strengths=_as_list(result_json.get("strengths", [])),
+        development_areas=_as_list(result_json.get("development_areas", [])),
         recommended_roles=result_json.get("recommended_roles", []),
         certifications=result_json.get("certifications", []),
         employability_score=employability_score,
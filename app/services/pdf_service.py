@@ -1,6 +1,11 @@
+import asyncio
 import pdfkit
 import os
 import re
+from concurrent.futures import Executor
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
 from jinja2 import Environment, FileSystemLoader
 from app.core.config import settings
 from app.models.psychometric import StudentDetailsInput, AIAnalysisResult, ProcessedTest
@@ -9,20 +14,74 @@ REPORTS_DIR = "media/reports"
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
 env = Environment(loader=FileSystemLoader("app/templates"))
+_REPORT_TEMPLATE = env.get_template("report_template.html")
+
+_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9]')
 
 def sanitize_filename_part(text: str) -> str:
     """Removes special characters and replaces spaces with underscores."""
     if not text:
         return "Unknown"
-    return re.sub(r'[^a-zA-Z0-9]', '_', text.strip().replace(' ', '_'))
+    return _SANITIZE_RE.sub('_', text.strip())
+
+PDF_OPTIONS = {
+    "page-size": "A4",
+    "margin-top": "0.4in",
+    "margin-right": "0.4in",
+    "margin-bottom": "0.4in",
+    "margin-left": "0.4in",
+    "enable-local-file-access": ""
+}
+
+PAGE_CSS = "@page { size: A4; margin: 0.4in; }"
+
+@lru_cache(maxsize=1)
+def _weasyprint_page_css():
+    from weasyprint import CSS
+    return CSS(string=PAGE_CSS)
+
+def _render_pdf_sync(html_out: str, file_path: str, options: dict) -> None:
+    """
+    Converts the HTML with the configured PDF_ENGINE. Blocking, so meant to be
+    called from an executor. WeasyPrint renders in-process; wkhtmltopdf forks
+    a new process per call.
+    """
+    if settings.PDF_ENGINE == "weasyprint":
+        from weasyprint import HTML
+        HTML(string=html_out, base_url=settings.BASE_URL).write_pdf(
+            file_path, stylesheets=[_weasyprint_page_css()], presentational_hints=True
+        )
+        return
+
+    try:
+        pdfkit.from_string(html_out, file_path, options=options)
+    except OSError as e:
+        if not os.path.exists(file_path):
+            raise e
 
-def generate_pdf(student: StudentDetailsInput, tests: list[ProcessedTest], ai_result: AIAnalysisResult) -> tuple[str, str]:
+def report_path(student: StudentDetailsInput, suffix: Optional[str] = None) -> Path:
+    """REPORTS_DIR/<name>_<institution>_<register_no>[_<suffix>].pdf"""
+    parts = [student.student_name, student.institution, student.register_no]
+    if suffix:
+        parts.append(suffix)
+    return Path(REPORTS_DIR) / ("_".join(sanitize_filename_part(p) for p in parts) + ".pdf")
+
+async def generate_pdf(
+    student: StudentDetailsInput,
+    tests: list[ProcessedTest],
+    ai_result: AIAnalysisResult,
+    out_path: Optional[Path] = None,
+    executor: Optional[Executor] = None
+) -> tuple[str, str]:
     """
     Renders the HTML template and converts it to PDF.
+    The Jinja render runs in-process; only the PDF conversion is handed to
+    `executor` (the default thread pool when None), keeping the event loop free.
+    The PDF is written straight to `out_path` (defaults to report_path(student));
+    the document is never held in memory. `out_path` must be inside
+    REPORTS_DIR, which is where report_url serves from.
     Returns: (filename, report_url)
     """
-    template = env.get_template("report_template.html")
-
     student_context = {
         "student_name": student.student_name,
         "email": student.email,                 
@@ -32,34 +91,23 @@ def generate_pdf(student: StudentDetailsInput, tests: list[ProcessedTest], ai_re
         "career_goal": "Software Professional" 
     }
     
-    html_out = template.render(
+    html_out = _REPORT_TEMPLATE.render(
         student=student_context,
         tests=tests,
         ai=ai_result,
         base_url=settings.BASE_URL
     )
     
-    safe_name = sanitize_filename_part(student.student_name)
-    safe_inst = sanitize_filename_part(student.institution)
-    safe_reg = sanitize_filename_part(student.register_no)
-    
-    filename = f"{safe_name}_{safe_inst}_{safe_reg}.pdf"
-    file_path = os.path.join(REPORTS_DIR, filename)
-    
-    options = {
-        "page-size": "A4",
-        "margin-top": "0.4in",
-        "margin-right": "0.4in",
-        "margin-bottom": "0.4in",
-        "margin-left": "0.4in",
-        "enable-local-file-access": ""
-    }
-    
-    try:
-        pdfkit.from_string(html_out, file_path, options=options)
-    except OSError as e:
-        if not os.path.exists(file_path):
-            raise e
+    if out_path is None:
+        out_path = report_path(student)
+    elif Path(out_path).resolve().parent != Path(REPORTS_DIR).resolve():
+        raise ValueError(f"out_path must be inside {REPORTS_DIR}: {out_path}")
+
+    filename = out_path.name
+    file_path = str(out_path)
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(executor, _render_pdf_sync, html_out, file_path, PDF_OPTIONS)
     
     report_url = f"{settings.BASE_URL}/media/reports/{filename}"
     
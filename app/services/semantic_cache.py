@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from typing import Hashable, Optional, Sequence
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Reuses LLM answers for profiles that are near-identical to one seen before.
+
+    Profiles are bucketed by an exact key (provider, model, course and the
+    ordered test/section labels). Within a bucket, a profile is represented
+    by its vector of section scores, and a stored answer is reused when every
+    score lies within `tolerance` percentage points of the query.
+    A tolerance of 0 disables the cache; empty profiles are never cached.
+    """
+
+    def __init__(self, tolerance: float, max_entries: int = 10000):
+        self.tolerance = tolerance
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._buckets: dict = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.tolerance > 0
+
+    def get(self, bucket: Hashable, scores: Sequence[float]) -> Optional[str]:
+        if self.tolerance <= 0 or not scores:
+            return None
+        candidates = self._buckets.get(bucket)
+        if not candidates:
+            return None
+
+        keys = list(candidates)
+        deltas = np.abs(np.array(keys) - np.asarray(scores, dtype=float)).max(axis=1)
+        best = int(deltas.argmin())
+        if deltas[best] > self.tolerance:
+            return None
+
+        entry_key = (bucket, keys[best])
+        self._entries.move_to_end(entry_key)
+        return self._entries[entry_key]
+
+    def put(self, bucket: Hashable, scores: Sequence[float], response: str) -> None:
+        if self.tolerance <= 0 or not scores:
+            return
+        vector = tuple(float(s) for s in scores)
+        entry_key = (bucket, vector)
+        self._entries[entry_key] = response
+        self._entries.move_to_end(entry_key)
+        self._buckets.setdefault(bucket, set()).add(vector)
+
+        while len(self._entries) > self.max_entries:
+            (old_bucket, old_vector), _ = self._entries.popitem(last=False)
+            bucket_vectors = self._buckets[old_bucket]
+            bucket_vectors.discard(old_vector)
+            if not bucket_vectors:
+                del self._buckets[old_bucket]
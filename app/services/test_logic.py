@@ -1,89 +1,273 @@
+import asyncio
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
+import math
+import sys
+import numpy as np
 from app.models.psychometric import RawPsychometricTest, ProcessedSection, ProcessedTest
 from app.services.chart_factory import ChartFactory
-import json
+
+_VECTORIZE_MIN_SECTIONS = 64
+
+_BENCH_BOUNDS = (40, 60, 75)
+_BENCH_LABELS = ("Below Average", "Average", "Above Average", "High")
+
+
+@lru_cache(maxsize=4096)
+def _parse_score_cached(score_str: str) -> float:
+    idx = score_str.find("/")
+    if idx < 0:
+        try:
+            return float(score_str)
+        except ValueError:
+            return 0.0
+    try:
+        num = float(score_str[:idx])
+        den = float(score_str[idx + 1:])
+    except ValueError:
+        return 0.0
+    return 0.0 if den == 0 else math.floor(num * 1000.0 / den + 0.5) / 10.0
+
+
+_CHART_DISPATCH = {
+    "second": ("bar", lambda labels, scores: ChartFactory.generate_bar_chart(labels, scores, color="#4a90e2")),
+    "first": ("radar", ChartFactory.generate_radar_chart),
+    "third": ("donut", ChartFactory.generate_radial_bar_chart),
+    "fourth": ("seven_segment", ChartFactory.generate_seven_segment_chart),
+    "fifth": ("vark_circles", lambda labels, scores: ChartFactory.generate_vark_circles(scores, labels)),
+}
+_DEFAULT_CHART = ("variable_radius", ChartFactory.generate_variable_radius_chart)
+
+
+class _LRU:
+    """Small thread-safe LRU; charts are rendered in worker threads."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_CHART_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="charts")
+
+_processed_cache = _LRU(256)
+_chart_cache = _LRU(256)
+
+
+def _make_chart_renderer(chart_key: str, render):
+    """Renderer specialised for one chart type, memoized through _chart_cache."""
+    def render_charts(labels: List[str], scores: List[float]) -> dict:
+        cache_key = (chart_key, tuple(labels), tuple(scores))
+        image = _chart_cache.get(cache_key)
+        if image is None:
+            image = render(labels, scores)
+            _chart_cache.put(cache_key, image)
+        return {chart_key: image}
+    return render_charts
+
+
+_CHART_RENDERERS = {key: _make_chart_renderer(*spec) for key, spec in _CHART_DISPATCH.items()}
+_DEFAULT_RENDERER = _make_chart_renderer(*_DEFAULT_CHART)
+
+
+@lru_cache(maxsize=64)
+def _chart_renderer_for(key_name: Optional[str]):
+    key = key_name.lower() if key_name else "default"
+    return _CHART_RENDERERS.get(key, _DEFAULT_RENDERER)
+
+
+def _processed_key(raw_test: RawPsychometricTest) -> tuple:
+    # parsed_sections is derived from json_result, so these three fields fully
+    # determine the processed test.
+    return (raw_test.key_name, raw_test.category, raw_test.json_result)
+
+
+def _get_processed(key: tuple) -> Optional[ProcessedTest]:
+    """
+    Cached ProcessedTest for `key`, as a copy with its own charts dict since
+    callers replace charts (e.g. the personalised VARK chart).
+    """
+    cached = _processed_cache.get(key)
+    if cached is None:
+        return None
+    return cached.model_copy(update={"charts": dict(cached.charts)})
+
+
+def _put_processed(key: tuple, processed: ProcessedTest) -> None:
+    _processed_cache.put(key, processed.model_copy(update={"charts": dict(processed.charts)}))
+
+
+@lru_cache(maxsize=4096)
+def _score_and_benchmark_cached(score_str: str) -> tuple[float, str]:
+    pct = _parse_score_cached(score_str)
+    return pct, _BENCH_LABELS[bisect_right(_BENCH_BOUNDS, pct)]
+
 
 class TestProcessor:
     @staticmethod
     def parse_score(score_str: str) -> float:
-        try:
-            if "/" in score_str:
-                num, den = map(float, score_str.split('/'))
-                if den == 0: return 0.0
-                return round((num / den) * 100, 1)
-            return float(score_str)
-        except (ValueError, TypeError):
+        if not isinstance(score_str, str):
             return 0.0
+        return _parse_score_cached(score_str)
 
     @staticmethod
-    def get_benchmark(score: float) -> str:
-        if score >= 75: return "High"
-        if score >= 60: return "Above Average"
-        if score >= 40: return "Average"
-        return "Below Average"
+    def parse_score_and_benchmark(score_str: str) -> tuple[float, str]:
+        """parse_score and get_benchmark in one cached call."""
+        if not isinstance(score_str, str):
+            return 0.0, _BENCH_LABELS[0]
+        return _score_and_benchmark_cached(score_str)
 
     @classmethod
-    def process_raw(cls, raw_test: RawPsychometricTest) -> ProcessedTest:
-        processed_sections = []
-        labels = []
-        scores = []
-
-        test_name = raw_test.category
-        test_description = ""
-        
-        if raw_test.json_result:
+    def score_sections(cls, raw_scores: List[str]) -> tuple[List[float], List[str]]:
+        """(percentages, benchmarks) for all scores of a test."""
+        if len(raw_scores) >= _VECTORIZE_MIN_SECTIONS:
+            scores = cls.parse_scores(raw_scores)
+            return scores, cls.get_benchmarks(scores)
+        pairs = [cls.parse_score_and_benchmark(raw) for raw in raw_scores]
+        return [pct for pct, _ in pairs], [benchmark for _, benchmark in pairs]
+
+    @classmethod
+    def parse_scores(cls, score_strs: List[str]) -> List[float]:
+        """
+        Parses all scores of a test. Large tests whose scores are all "num/den"
+        are computed in one numpy pass; anything else uses parse_score per item.
+        """
+        if len(score_strs) >= _VECTORIZE_MIN_SECTIONS and all(
+            isinstance(s, str) and "/" in s for s in score_strs
+        ):
+            parts = [s.split("/", 1) for s in score_strs]
             try:
-                data = json.loads(raw_test.json_result)
-                if isinstance(data, dict):
-                    test_name = data.get("test_name", test_name)
-                    test_description = data.get("description", "")
-            except json.JSONDecodeError:
+                num = np.fromiter((float(p[0]) for p in parts), dtype=np.float64, count=len(parts))
+                den = np.fromiter((float(p[1]) for p in parts), dtype=np.float64, count=len(parts))
+            except ValueError:
                 pass
+            else:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    pcts = np.where(den == 0, 0.0, np.floor(num * 1000.0 / den + 0.5) / 10.0)
+                return pcts.tolist()
+        return [cls.parse_score(s) for s in score_strs]
+
+    @staticmethod
+    def get_benchmark(score: float) -> str:
+        return _BENCH_LABELS[bisect_right(_BENCH_BOUNDS, score)]
+
+    @classmethod
+    def get_benchmarks(cls, scores: List[float]) -> List[str]:
+        """Benchmarks for a whole test; large tests are classified in one numpy pass."""
+        if len(scores) < _VECTORIZE_MIN_SECTIONS:
+            return [cls.get_benchmark(pct) for pct in scores]
+        idx = np.searchsorted(_BENCH_BOUNDS, scores, side="right")
+        return [_BENCH_LABELS[i] for i in idx.tolist()]
+
+    @classmethod
+    def _process_raw_data(cls, raw_test: RawPsychometricTest) -> tuple[ProcessedTest, List[str], List[float]]:
+        """Builds the sections of a test; charts are left empty."""
+        data = raw_test.parsed_result
+        test_name = data.get("test_name", raw_test.category)
+        test_description = data.get("description", "")
 
         sections = raw_test.parsed_sections
-        for section in sections:
-            pct = cls.parse_score(section.section_score)
-            labels.append(section.section)
-            scores.append(pct)
-            benchmark = cls.get_benchmark(pct)
-            
-            interp = section.interpretation
-            if not interp:
-                interp = section.description or section.representation or "No interpretation available."
-
-            processed_sections.append(ProcessedSection(
-                section=section.section,
+        labels = [sys.intern(section.section) for section in sections]
+        raw_scores = [section.section_score for section in sections]
+        scores, benchmarks = cls.score_sections(raw_scores)
+        interps = [
+            section.interpretation or section.description or section.representation
+            or "No interpretation available."
+            for section in sections
+        ]
+
+        # Every field is already a validated str/float here, so skip re-validation.
+        processed_sections = [
+            ProcessedSection.model_construct(
+                section=label,
                 score_percentage=pct,
-                original_score=section.section_score,
+                original_score=raw,
                 interpretation=interp,
                 benchmark=benchmark
-            ))
-
-        charts = {}
-        if scores:
-            key = raw_test.key_name.lower() if raw_test.key_name else "default"
-
-            if key == "second":
-                charts['bar'] = ChartFactory.generate_bar_chart(labels, scores, color="#4a90e2")
-            
-            elif key == "first":
-                charts['radar'] = ChartFactory.generate_radar_chart(labels, scores)
-            
-            elif key == "third":
-                charts['donut'] = ChartFactory.generate_radial_bar_chart(labels, scores)
-            
-            elif key == "fourth":
-                charts['seven_segment'] = ChartFactory.generate_seven_segment_chart(labels, scores)
-
-            elif key == "fifth":
-                charts['vark_circles'] = ChartFactory.generate_vark_circles(scores, labels)
+            )
+            for label, pct, raw, interp, benchmark in zip(labels, scores, raw_scores, interps, benchmarks)
+        ]
 
-            else:
-                charts['variable_radius'] = ChartFactory.generate_variable_radius_chart(labels, scores)
-                
-        return ProcessedTest(
+        processed = ProcessedTest(
             test_name=test_name,
             description=test_description,
             key_name=raw_test.key_name,
             sections=processed_sections,
-            charts=charts
-        )
\ No newline at end of file
+            charts={}
+        )
+        return processed, labels, scores
+
+    @staticmethod
+    def _render_charts(key_name: str, labels: List[str], scores: List[float]) -> dict:
+        """Renders the chart(s) for one test; CPU-bound, safe to run in a worker thread."""
+        if not scores:
+            return {}
+        return _chart_renderer_for(key_name)(labels, scores)
+
+    @classmethod
+    def process_raw(cls, raw_test: RawPsychometricTest) -> ProcessedTest:
+        key = _processed_key(raw_test)
+        cached = _get_processed(key)
+        if cached is not None:
+            return cached
+        processed, labels, scores = cls._process_raw_data(raw_test)
+        processed.charts = cls._render_charts(raw_test.key_name, labels, scores)
+        _put_processed(key, processed)
+        return processed
+
+    @classmethod
+    async def process_raw_async(
+        cls,
+        raw_test: RawPsychometricTest,
+        executor: Optional[Executor] = None
+    ) -> ProcessedTest:
+        """
+        Same as process_raw, but the chart rendering runs in `executor`
+        (_CHART_POOL when None).
+        """
+        key = _processed_key(raw_test)
+        cached = _get_processed(key)
+        if cached is not None:
+            return cached
+        processed, labels, scores = cls._process_raw_data(raw_test)
+        loop = asyncio.get_running_loop()
+        processed.charts = await loop.run_in_executor(
+            executor or _CHART_POOL, cls._render_charts, raw_test.key_name, labels, scores
+        )
+        _put_processed(key, processed)
+        return processed
+
+
+async def build_processed_tests_async(
+    psychometric_data: List[RawPsychometricTest],
+    executor: Optional[Executor] = None
+) -> List[ProcessedTest]:
+    """
+    Processes every non-empty test of a student, charts included.
+    The charts of all tests render concurrently in `executor`
+    (_CHART_POOL when None).
+    """
+    processed = await asyncio.gather(*[
+        TestProcessor.process_raw_async(raw_test, executor)
+        for raw_test in psychometric_data
+        if raw_test.json_result
+    ])
+    return [test for test in processed if test.sections]